@@ -1,9 +1,14 @@
-from fastapi import FastAPI, HTTPException
-from database import get_latest_snapshot
-import pandas as pd
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query
+from database import init_db, get_latest_snapshot_records, get_term_structure, get_latest_chains
 
 app = FastAPI(title="Option Chain API")
 
+@app.on_event("startup")
+def startup():
+    # Creates tables/indexes added since the database was first built (e.g. option_chain_summary)
+    init_db()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Option Chain API. Use /latest-chain/{symbol}/{expiry} to get data."}
@@ -15,7 +20,7 @@ def get_latest_chain(symbol: str, expiry: str):
     Symbol format: NSE_INDEX|Nifty 50 (URL encode | as %7C)
     Expiry format: YYYY-MM-DD
     """
-    timestamp, spot_price, data = get_latest_snapshot(symbol, expiry)
+    timestamp, spot_price, data = get_latest_snapshot_records(symbol, expiry)
     if data is None:
         raise HTTPException(status_code=404, detail="Data not found for the given symbol and expiry.")
 
@@ -24,7 +29,43 @@ def get_latest_chain(symbol: str, expiry: str):
         "expiry": expiry,
         "timestamp": timestamp,
         "spot_price": spot_price,
-        "data": data.to_dict(orient='records')
+        "data": data
+    }
+
+@app.get("/term-structure/{symbol}")
+def get_symbol_term_structure(symbol: str, expiry: Optional[List[str]] = Query(None)):
+    """
+    Returns ATM IV, 25-delta skew, PCR and total OI for every unexpired expiry of a
+    symbol (latest snapshot of each), in one request.
+    Pass repeated ?expiry=YYYY-MM-DD parameters to pick expiries, including expired ones.
+    """
+    term_structure = get_term_structure(symbol, expiry)
+    if not term_structure:
+        raise HTTPException(status_code=404, detail="Data not found for the given symbol.")
+
+    return {
+        "symbol": symbol,
+        "term_structure": term_structure
+    }
+
+@app.get("/chains/{symbol}")
+def get_multi_chain(symbol: str,
+                    expiry: Optional[List[str]] = Query(None),
+                    strike_min: Optional[float] = None,
+                    strike_max: Optional[float] = None,
+                    moneyness: Optional[float] = Query(None, gt=0, le=1)):
+    """
+    Returns the latest chain of every unexpired expiry of a symbol, sliced by strike range
+    (strike_min/strike_max) and/or moneyness (fraction of spot, e.g. 0.02 = +/-2%).
+    Pass repeated ?expiry=YYYY-MM-DD parameters to pick expiries, including expired ones.
+    """
+    chains = get_latest_chains(symbol, expiry, strike_min, strike_max, moneyness)
+    if not chains:
+        raise HTTPException(status_code=404, detail="Data not found for the given symbol and filters.")
+
+    return {
+        "symbol": symbol,
+        "chains": chains
     }
 
 if __name__ == "__main__":
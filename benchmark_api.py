@@ -0,0 +1,123 @@
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+import database
+from math_engine import get_implied_volatility, calculate_greeks
+
+# --- BATCH vs SINGLE-CHAIN QUERY BENCHMARK ---
+# Builds a throwaway database of synthetic snapshots, then compares the batch
+# queries behind /term-structure and /chains against the equivalent series of
+# /latest-chain lookups (one get_latest_snapshot_records call per expiry).
+# "speedup" is single/batch time at the database layer; HTTP round trips saved
+# by the batch endpoints are not included, so a value below 1x means slower here.
+SYMBOL = "NSE_INDEX|Nifty 50"
+SPOT = 25500.0
+R = 0.07
+
+def build_db(path, n_expiries, n_strikes, n_snapshots):
+    database.DB_NAME = path
+    database.init_db()
+    conn = sqlite3.connect(path)
+    start = datetime.datetime(2026, 1, 19, 9, 15)
+    # Expiries from tomorrow onwards, so they pass the default "unexpired only" filter
+    first_expiry = datetime.date.today() + datetime.timedelta(days=1)
+    expiries = [(first_expiry + datetime.timedelta(weeks=i)).isoformat() for i in range(n_expiries)]
+    strikes = [SPOT - 50 * (n_strikes // 2) + 50 * i for i in range(n_strikes)]
+
+    for e_idx, expiry in enumerate(expiries):
+        t = (e_idx * 7 + 1.5) / 365.0
+        for s_idx in range(n_snapshots):
+            spot = SPOT + 5 * (s_idx % 20 - 10)
+            rows = []
+            for strike in strikes:
+                # Smile: IV rises away from the money, more on the put side
+                iv = 0.12 + 0.5 * (abs(strike - spot) / spot) + (0.02 if strike < spot else 0)
+                c_ltp = round(max(spot - strike, 0) + spot * iv * (t ** 0.5) * 0.4, 2)
+                p_ltp = round(max(strike - spot, 0) + spot * iv * (t ** 0.5) * 0.4, 2)
+                c_iv = get_implied_volatility(c_ltp, spot, strike, t, R, 'CE') * 100
+                p_iv = get_implied_volatility(p_ltp, spot, strike, t, R, 'PE') * 100
+                c_greeks = calculate_greeks(spot, strike, t, R, c_iv / 100, 'CE')
+                p_greeks = calculate_greeks(spot, strike, t, R, p_iv / 100, 'PE')
+                rows.append({
+                    'strike': strike, 'c_ltp': c_ltp, 'c_oi': 1000 + s_idx * 10 + int(strike) % 700, 'c_chng_oi': 10,
+                    'c_iv': round(c_iv, 2), 'c_delta': c_greeks['delta'], 'c_theta': c_greeks['theta'], 'c_trend': "Neutral",
+                    'p_ltp': p_ltp, 'p_oi': 1200 + s_idx * 12 + int(strike) % 500, 'p_chng_oi': 12,
+                    'p_iv': round(p_iv, 2), 'p_delta': p_greeks['delta'], 'p_theta': p_greeks['theta'], 'p_trend': "Neutral"
+                })
+            timestamp_str = (start + datetime.timedelta(minutes=s_idx)).strftime('%Y-%m-%d %H:%M:%S')
+            database.insert_snapshot(conn.cursor(), timestamp_str, SYMBOL, expiry, spot, json.dumps(rows))
+    conn.commit()
+    conn.close()
+    return expiries
+
+def term_structure_via_single_chains(symbol, expiries):
+    """What a client does today: one /latest-chain call per expiry, metrics computed client-side."""
+    result = []
+    for expiry in expiries:
+        timestamp, spot_price, data = database.get_latest_snapshot_records(symbol, expiry)
+        if data is None: continue
+        item = {'expiry': expiry, 'timestamp': timestamp, 'spot_price': spot_price}
+        item.update(database.summarize_chain(spot_price, data))
+        result.append(item)
+    return result
+
+def chains_via_single_chains(symbol, expiries, moneyness):
+    result = []
+    for expiry in expiries:
+        timestamp, spot_price, data = database.get_latest_snapshot_records(symbol, expiry)
+        if data is None: continue
+        lo, hi = spot_price * (1 - moneyness), spot_price * (1 + moneyness)
+        sliced = [d for d in data if lo <= d['strike'] <= hi]
+        if sliced:
+            result.append({'expiry': expiry, 'timestamp': timestamp, 'spot_price': spot_price, 'data': sliced})
+    return result
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch term-structure/multi-chain queries against per-expiry lookups.")
+    parser.add_argument("--expiries", type=int, default=8)
+    parser.add_argument("--strikes", type=int, default=60)
+    parser.add_argument("--snapshots", type=int, default=120, help="Snapshots stored per expiry")
+    parser.add_argument("--moneyness", type=float, default=0.02)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"Building {args.expiries} expiries x {args.snapshots} snapshots x {args.strikes} strikes...")
+        expiries = build_db(path, args.expiries, args.strikes, args.snapshots)
+
+        # Same answers both ways, otherwise the timings mean nothing
+        batch_ts = database.get_term_structure(SYMBOL)
+        single_ts = term_structure_via_single_chains(SYMBOL, expiries)
+        assert batch_ts == single_ts, "term structure mismatch between batch and single-chain paths"
+        batch_chains = database.get_latest_chains(SYMBOL, moneyness=args.moneyness)
+        single_chains = chains_via_single_chains(SYMBOL, expiries, args.moneyness)
+        assert batch_chains == single_chains, "multi-chain slice mismatch between batch and single-chain paths"
+
+        results = [
+            ("term structure", timed(lambda: database.get_term_structure(SYMBOL), args.runs),
+             timed(lambda: term_structure_via_single_chains(SYMBOL, expiries), args.runs)),
+            (f"chains +/-{args.moneyness:.0%}", timed(lambda: database.get_latest_chains(SYMBOL, moneyness=args.moneyness), args.runs),
+             timed(lambda: chains_via_single_chains(SYMBOL, expiries, args.moneyness), args.runs)),
+        ]
+
+    print(f"{'query':<20}{'batch ms':>12}{'N x single ms':>16}{'speedup':>10}")
+    for name, batch_ms, single_ms in results:
+        print(f"{name:<20}{batch_ms:>12.2f}{single_ms:>16.2f}{single_ms / batch_ms:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
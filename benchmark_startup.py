@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# --- STARTUP BUDGETS ---
+# Each entry point is imported in a fresh interpreter so nothing is cached.
+#   import_ms  : time spent inside `import <module>` (measured in the child)
+#   process_ms : wall time of a fresh `python -c "import <module>"` (interpreter start + import).
+#                This is not a full launch: it stops before the entry point's own setup
+#                (init_db, the worker loop, uvicorn/streamlit serving).
+#   forbidden  : heavy modules that must NOT be loaded just by importing the entry point
+ENTRY_POINTS = {
+    "data_worker": {"import_ms": 300, "process_ms": 500, "forbidden": ["scipy", "numpy", "pandas"]},
+    "fill_missing_data": {"import_ms": 300, "process_ms": 500, "forbidden": ["scipy", "numpy", "pandas"]},
+    "api_server": {"import_ms": 800, "process_ms": 1000, "forbidden": ["scipy", "pandas"]},
+    "main": {"import_ms": 2500, "process_ms": 3000, "forbidden": ["scipy", "plotly"]},
+}
+
+HEAVY_MODULES = ["scipy", "numpy", "pandas", "plotly", "streamlit", "fastapi"]
+
+CHILD_SNIPPET = """
+import json, sys, time, importlib
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = (time.perf_counter() - start) * 1000
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print("__BENCH__" + json.dumps({{"import_ms": elapsed, "loaded": loaded}}))
+"""
+
+def measure_once(module):
+    """
+    Imports `module` in a fresh interpreter.
+    Returns (import_ms, process_ms, loaded_heavy_modules).
+    """
+    code = CHILD_SNIPPET.format(module=module, heavy=HEAVY_MODULES)
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], cwd=repo_dir, capture_output=True, text=True)
+    process_ms = (time.perf_counter() - start) * 1000
+
+    for line in proc.stdout.splitlines():
+        if line.startswith("__BENCH__"):
+            result = json.loads(line[len("__BENCH__"):])
+            return result["import_ms"], process_ms, result["loaded"]
+
+    err = proc.stderr.strip().splitlines()
+    raise RuntimeError(err[-1] if err else f"import of {module} failed")
+
+def run(modules, runs, scale):
+    failures = []
+    print(f"{'entry point':<20}{'import ms':>12}{'budget':>10}{'process ms':>12}{'budget':>10}  heavy modules loaded")
+    for module in modules:
+        budget = ENTRY_POINTS[module]
+        try:
+            samples = [measure_once(module) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"{module:<20}  ERROR: {e}")
+            failures.append(f"{module}: {e}")
+            continue
+
+        import_ms = statistics.median(s[0] for s in samples)
+        process_ms = statistics.median(s[1] for s in samples)
+        loaded = samples[-1][2]
+        import_budget = budget["import_ms"] * scale
+        process_budget = budget["process_ms"] * scale
+
+        print(f"{module:<20}{import_ms:>12.1f}{import_budget:>10.0f}{process_ms:>12.1f}{process_budget:>10.0f}  {', '.join(loaded) or '-'}")
+
+        if import_ms > import_budget:
+            failures.append(f"{module}: import {import_ms:.1f} ms > {import_budget:.0f} ms")
+        if process_ms > process_budget:
+            failures.append(f"{module}: process start {process_ms:.1f} ms > {process_budget:.0f} ms")
+        for heavy in budget["forbidden"]:
+            if heavy in loaded:
+                failures.append(f"{module}: imports {heavy} at startup")
+
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time and fresh-process start benchmark for each entry point.")
+    parser.add_argument("modules", nargs="*", default=list(ENTRY_POINTS), help="Entry points to benchmark (default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point; the median is reported")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply all time budgets (e.g. 2 on a slow machine)")
+    args = parser.parse_args()
+
+    unknown = [m for m in args.modules if m not in ENTRY_POINTS]
+    if unknown:
+        parser.error(f"unknown entry point(s): {', '.join(unknown)}")
+
+    failures = run(args.modules, args.runs, args.scale)
+    if failures:
+        print("\nBudget violations:")
+        for f in failures:
+            print(f"  - {f}")
+        sys.exit(1)
+    print("\nAll entry points within budget.")
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,10 @@
 import time
 import datetime
-import pandas as pd
-import numpy as np
-from scipy.stats import norm
+from math_engine import get_implied_volatility, calculate_greeks, get_time_to_expiry, get_smart_trend
 from upstox_engine import UpstoxEngine
-from database import init_db, save_snapshot, get_latest_snapshot
+from database import init_db, save_snapshot, get_latest_snapshot_records
 import config
 
-# --- MATH ENGINE ---
-def get_implied_volatility(price, spot, strike, t, r, flag):
-    if price <= 0.05 or t <= 0.0001: return 0
-    low, high = 0.01, 5.0
-    for _ in range(15):
-        mid = (low + high) / 2
-        try:
-            d1 = (np.log(spot / strike) + (r + 0.5 * mid ** 2) * t) / (mid * np.sqrt(t))
-            d2 = d1 - mid * np.sqrt(t)
-            if flag == 'CE':
-                theo = spot * norm.cdf(d1) - strike * np.exp(-r * t) * norm.cdf(d2)
-            else:
-                theo = strike * np.exp(-r * t) * norm.cdf(-d2) - spot * norm.cdf(-d1)
-            if abs(theo - price) < 0.1: return mid
-            if theo > price: high = mid
-            else: low = mid
-        except: return 0
-    return (low + high) / 2
-
-def calculate_greeks(spot, strike, t, r, iv, opt_type):
-    try:
-        if iv <= 0.001 or t <= 0.0001 or spot <= 0: return {'delta': 0, 'theta': 0, 'gamma': 0, 'vega': 0}
-        d1 = (np.log(spot / strike) + (r + 0.5 * iv ** 2) * t) / (iv * np.sqrt(t))
-        d2 = d1 - iv * np.sqrt(t)
-        if opt_type == 'CE':
-            delta = norm.cdf(d1)
-            theta = (-spot * norm.pdf(d1) * iv / (2 * np.sqrt(t)) - r * strike * np.exp(-r * t) * norm.cdf(d2)) / 365
-        else:
-            delta = norm.cdf(d1) - 1
-            theta = (-spot * norm.pdf(d1) * iv / (2 * np.sqrt(t)) + r * strike * np.exp(-r * t) * norm.cdf(-d2)) / 365
-        gamma = norm.pdf(d1) / (spot * iv * np.sqrt(t))
-        vega = spot * np.sqrt(t) * norm.pdf(d1) / 100
-        return {'delta': round(delta, 3), 'theta': round(theta, 2), 'gamma': round(gamma, 5), 'vega': round(vega, 2)}
-    except: return {'delta': 0, 'theta': 0, 'gamma': 0, 'vega': 0}
-
-def get_time_to_expiry(expiry_date_str):
-    try:
-        expiry = datetime.datetime.strptime(expiry_date_str, "%Y-%m-%d")
-        today = datetime.datetime.now()
-        expiry = expiry.replace(hour=15, minute=30, second=0)
-        diff = expiry - today
-        T = (diff.days + diff.seconds / 86400) / 365.0
-        return max(T, 0.00001)
-    except: return 0.00001
-
-def get_smart_trend(price_chg, oi_chg):
-    if price_chg > 0 and oi_chg > 0: return "Long Buildup"
-    if price_chg < 0 and oi_chg > 0: return "Short Buildup"
-    if price_chg < 0 and oi_chg < 0: return "Long Unwinding"
-    if price_chg > 0 and oi_chg < 0: return "Short Covering"
-    return "Neutral"
-
 def process_and_save():
     engine = UpstoxEngine()
     init_db()
@@ -90,10 +36,10 @@ def process_and_save():
                     continue
 
                 # Fetch previous snapshot for interval change calculation (today only)
-                _, prev_spot, prev_df = get_latest_snapshot(symbol, expiry, same_day_only=True)
+                _, prev_spot, prev_rows = get_latest_snapshot_records(symbol, expiry, same_day_only=True)
                 prev_data_map = {}
-                if prev_df is not None:
-                    for _, row in prev_df.iterrows():
+                if prev_rows is not None:
+                    for row in prev_rows:
                         prev_data_map[row['strike']] = row
 
                 T = get_time_to_expiry(expiry)
@@ -145,9 +91,8 @@ def process_and_save():
                         'p_delta': p_greeks['delta'], 'p_theta': p_greeks['theta'], 'p_trend': p_trend
                     })
 
-                df = pd.DataFrame(clean_data)
-                save_snapshot(symbol, expiry, spot_price, df)
-                print(f"  -> Saved {len(df)} rows for {symbol}")
+                save_snapshot(symbol, expiry, spot_price, clean_data)
+                print(f"  -> Saved {len(clean_data)} rows for {symbol}")
             except Exception as e:
                 print(f"  -> Error processing {symbol}: {e}")
 
@@ -1,8 +1,10 @@
 import sqlite3
-import pandas as pd
 import json
 import datetime
 
+# NOTE: pandas is imported inside the functions that build DataFrames so that
+# entry points which only need raw JSON (api_server) do not pay for it at import.
+
 DB_NAME = "option_chain.db"
 
 def init_db():
@@ -22,36 +24,156 @@ def init_db():
         )
     ''')
 
+    # Serves "latest snapshot per (symbol, expiry)" lookups without a table scan
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_snapshots_symbol_expiry_ts
+        ON option_chain_snapshots (symbol, expiry, timestamp)
+    ''')
+
+    # Per-snapshot summary, written alongside each snapshot so term-structure
+    # queries never have to decode the chain JSON
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS option_chain_summary (
+            timestamp DATETIME,
+            symbol TEXT,
+            expiry TEXT,
+            spot_price REAL,
+            atm_strike REAL,
+            atm_iv REAL,
+            skew_25d REAL,
+            total_c_oi INTEGER,
+            total_p_oi INTEGER,
+            pcr REAL,
+            UNIQUE(symbol, expiry, timestamp)
+        )
+    ''')
+
     conn.commit()
     conn.close()
 
-def save_snapshot(symbol, expiry, spot_price, df_data):
+def save_snapshot(symbol, expiry, spot_price, records):
     """
     Saves a snapshot of the option chain to the database.
-    df_data should be a pandas DataFrame.
+    records should be a list of row dicts (one per strike).
     """
     conn = sqlite3.connect(DB_NAME)
-    # Convert DataFrame to JSON for storage
-    data_json = df_data.to_json(orient='records')
+    # Stored as records-oriented JSON, same layout as DataFrame.to_json(orient='records')
+    data_json = json.dumps(records)
 
     # Get current IST time
-    import datetime
     ist_now = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=5, minutes=30)
     timestamp_str = ist_now.strftime('%Y-%m-%d %H:%M:%S')
 
-    cursor = conn.cursor()
+    try:
+        cursor = conn.cursor()
+        insert_snapshot(cursor, timestamp_str, symbol, expiry, spot_price, data_json)
+        conn.commit()
+    finally:
+        conn.close()
+
+def summarize_chain(spot_price, records):
+    """
+    Term-structure metrics for one chain (list of row dicts):
+    ATM strike/IV, 25-delta skew (put IV - call IV), total OI and PCR.
+    Missing or null fields count as 0; rows where the IV solver failed (IV or delta 0)
+    are not used for the 25-delta skew, which is None if no usable row exists.
+    """
+    def num(d, key):
+        return d.get(key) or 0
+
+    records = [d for d in records if d.get('strike') is not None]
+    if not records:
+        return {'atm_strike': None, 'atm_iv': None, 'skew_25d': None, 'total_c_oi': 0, 'total_p_oi': 0, 'pcr': 0}
+
+    atm = min(records, key=lambda d: abs(d['strike'] - spot_price))
+    atm_ivs = [iv for iv in (num(atm, 'c_iv'), num(atm, 'p_iv')) if iv > 0]
+
+    calls = [d for d in records if num(d, 'c_iv') > 0 and num(d, 'c_delta') != 0]
+    puts = [d for d in records if num(d, 'p_iv') > 0 and num(d, 'p_delta') != 0]
+    skew_25d = None
+    if calls and puts:
+        c25 = min(calls, key=lambda d: abs(num(d, 'c_delta') - 0.25))
+        p25 = min(puts, key=lambda d: abs(num(d, 'p_delta') + 0.25))
+        skew_25d = round(num(p25, 'p_iv') - num(c25, 'c_iv'), 2)
+
+    total_c_oi = sum(num(d, 'c_oi') for d in records)
+    total_p_oi = sum(num(d, 'p_oi') for d in records)
+
+    return {
+        'atm_strike': atm['strike'],
+        'atm_iv': round(sum(atm_ivs) / len(atm_ivs), 2) if atm_ivs else None,
+        'skew_25d': skew_25d,
+        'total_c_oi': total_c_oi,
+        'total_p_oi': total_p_oi,
+        'pcr': round(total_p_oi / total_c_oi, 2) if total_c_oi > 0 else 0
+    }
+
+def _insert_summary(cursor, timestamp_str, symbol, expiry, spot_price, data_json):
+    """
+    Inserts the summary row for a stored snapshot. Never raises: a bad chain only
+    costs its summary (rebuild_summaries can retry it later), never the snapshot.
+    """
+    try:
+        summary = summarize_chain(spot_price, json.loads(data_json))
+        cursor.execute('''
+            INSERT OR IGNORE INTO option_chain_summary
+                (timestamp, symbol, expiry, spot_price, atm_strike, atm_iv, skew_25d, total_c_oi, total_p_oi, pcr)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (timestamp_str, symbol, expiry, spot_price, summary['atm_strike'], summary['atm_iv'],
+              summary['skew_25d'], summary['total_c_oi'], summary['total_p_oi'], summary['pcr']))
+        return True
+    except Exception as e:
+        print(f"  -> Could not summarize {symbol} {expiry} @ {timestamp_str}: {e}")
+        return False
+
+def insert_snapshot(cursor, timestamp_str, symbol, expiry, spot_price, data_json):
+    """
+    Inserts a snapshot (data_json = records-oriented JSON) and, if the snapshot was
+    new, its summary row. The caller owns the connection and commits.
+    """
     cursor.execute('''
         INSERT OR IGNORE INTO option_chain_snapshots (timestamp, symbol, expiry, spot_price, data_json)
         VALUES (?, ?, ?, ?, ?)
     ''', (timestamp_str, symbol, expiry, spot_price, data_json))
 
-    conn.commit()
+    # A duplicate timestamp keeps the stored snapshot; don't summarize data that wasn't saved
+    if cursor.rowcount == 1:
+        _insert_summary(cursor, timestamp_str, symbol, expiry, spot_price, data_json)
+
+def rebuild_summaries(batch_size=500):
+    """
+    Fills option_chain_summary for snapshots stored before the summary table existed.
+    Walks the snapshots by id in batches, committing after each, so only one batch
+    of data_json is in memory at a time. Returns the number of summaries written.
+    """
+    conn = sqlite3.connect(DB_NAME)
+    cursor = conn.cursor()
+    last_id = 0
+    written = 0
+    while True:
+        # Read the whole batch before writing, so no read cursor is open during inserts
+        rows = conn.execute('''
+            SELECT s.id, s.timestamp, s.symbol, s.expiry, s.spot_price, s.data_json
+            FROM option_chain_snapshots s
+            LEFT JOIN option_chain_summary m
+                ON m.symbol = s.symbol AND m.expiry = s.expiry AND m.timestamp = s.timestamp
+            WHERE m.timestamp IS NULL AND s.id > ?
+            ORDER BY s.id
+            LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        for snapshot_id, timestamp_str, symbol, expiry, spot_price, data_json in rows:
+            if _insert_summary(cursor, timestamp_str, symbol, expiry, spot_price, data_json):
+                written += 1
+        last_id = rows[-1][0]
+        conn.commit()
     conn.close()
+    return written
 
-def get_latest_snapshot(symbol, expiry, same_day_only=False):
+def _fetch_latest_row(symbol, expiry, same_day_only=False):
     """
-    Retrieves the latest snapshot for a given symbol and expiry.
-    If same_day_only is True, only returns if snapshot is from today.
+    Returns the (timestamp, spot_price, data_json) row of the latest snapshot, or None.
     """
     conn = sqlite3.connect(DB_NAME)
 
@@ -70,21 +192,127 @@ def get_latest_snapshot(symbol, expiry, same_day_only=False):
         {where_clause}
         ORDER BY timestamp DESC LIMIT 1
     '''
-    df = pd.read_sql_query(query, conn, params=params)
+    row = conn.execute(query, params).fetchone()
     conn.close()
+    return row
+
+def get_latest_snapshot(symbol, expiry, same_day_only=False):
+    """
+    Retrieves the latest snapshot for a given symbol and expiry.
+    If same_day_only is True, only returns if snapshot is from today.
+    """
+    row = _fetch_latest_row(symbol, expiry, same_day_only)
 
-    if not df.empty:
+    if row is not None:
         import io
-        snapshot_time = df.iloc[0]['timestamp']
-        spot_price = df.iloc[0]['spot_price']
-        data = pd.read_json(io.StringIO(df.iloc[0]['data_json']))
+        import pandas as pd
+        snapshot_time, spot_price, data_json = row
+        data = pd.read_json(io.StringIO(data_json))
         return snapshot_time, spot_price, data
     return None, None, None
 
+def get_latest_snapshot_records(symbol, expiry, same_day_only=False):
+    """
+    Same as get_latest_snapshot, but returns the stored rows as a list of dicts
+    without going through pandas. Used by the API, which only re-serializes them.
+    """
+    row = _fetch_latest_row(symbol, expiry, same_day_only)
+
+    if row is not None:
+        snapshot_time, spot_price, data_json = row
+        return snapshot_time, spot_price, json.loads(data_json)
+    return None, None, None
+
+# Latest snapshot of every expiry of a symbol. {expiry_filter} is either
+# "AND expiry IN (?, ...)" for explicitly requested expiries, or
+# "AND expiry >= ?" (today, IST) so expired tenors drop out by default.
+# {joins}/{conditions}/{order} let callers attach the summary or expand the chain.
+_LATEST_PER_EXPIRY_QUERY = '''
+    SELECT {columns}
+    FROM option_chain_snapshots t
+    JOIN (
+        SELECT expiry, MAX(timestamp) AS timestamp
+        FROM option_chain_snapshots
+        WHERE symbol = ? {expiry_filter}
+        GROUP BY expiry
+    ) l ON t.expiry = l.expiry AND t.timestamp = l.timestamp
+    {joins}
+    WHERE t.symbol = ? {conditions}
+    ORDER BY {order}
+'''
+
+def _fetch_latest_per_expiry(symbol, expiries, columns, joins="", conditions=(), condition_params=(), order="t.expiry"):
+    params = [symbol]
+    if expiries:
+        expiry_filter = "AND expiry IN (" + ", ".join("?" for _ in expiries) + ")"
+        params.extend(expiries)
+    else:
+        ist_now = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=5, minutes=30)
+        expiry_filter = "AND expiry >= ?"
+        params.append(ist_now.strftime('%Y-%m-%d'))
+    params.append(symbol)
+    params.extend(condition_params)
+    query = _LATEST_PER_EXPIRY_QUERY.format(columns=", ".join(columns), expiry_filter=expiry_filter, joins=joins,
+                                            conditions="".join(" AND " + c for c in conditions), order=order)
+
+    conn = sqlite3.connect(DB_NAME)
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+    return rows
+
+def get_term_structure(symbol, expiries=None):
+    """
+    Returns the latest snapshot of every expiry of a symbol with its precomputed
+    summary (ATM IV, 25-delta skew, PCR, total OI), in a single query.
+    If that snapshot has no summary row (summary failed, or not yet backfilled by
+    rebuild_summaries) its metrics are None rather than an older snapshot's.
+    Only unexpired expiries (expiry >= today, IST) unless expiries are given explicitly.
+    """
+    keys = ['expiry', 'timestamp', 'spot_price', 'atm_strike', 'atm_iv', 'skew_25d', 'total_c_oi', 'total_p_oi', 'pcr']
+    columns = ['t.expiry', 't.timestamp', 't.spot_price', 'm.atm_strike', 'm.atm_iv', 'm.skew_25d', 'm.total_c_oi', 'm.total_p_oi', 'm.pcr']
+    joins = '''LEFT JOIN option_chain_summary m
+        ON m.symbol = t.symbol AND m.expiry = t.expiry AND m.timestamp = t.timestamp'''
+    rows = _fetch_latest_per_expiry(symbol, expiries, columns, joins=joins)
+    return [dict(zip(keys, row)) for row in rows]
+
+def get_latest_chains(symbol, expiries=None, strike_min=None, strike_max=None, moneyness=None):
+    """
+    Returns the latest chain of every expiry of a symbol, sliced to the requested strikes.
+    strike_min/strike_max bound the strike directly; moneyness keeps strikes within
+    +/- that fraction of spot (e.g. 0.02 = 2%). The slicing runs in SQL (json_each),
+    so only matching rows are decoded in Python; a snapshot with malformed JSON is skipped.
+    Only unexpired expiries (expiry >= today, IST) unless expiries are given explicitly;
+    expiries with no matching strikes are omitted.
+    """
+    strike = "json_extract(j.value, '$.strike')"
+    conditions = [f"{strike} IS NOT NULL"]
+    condition_params = []
+    if strike_min is not None:
+        conditions.append(f"{strike} >= ?")
+        condition_params.append(strike_min)
+    if strike_max is not None:
+        conditions.append(f"{strike} <= ?")
+        condition_params.append(strike_max)
+    if moneyness is not None:
+        conditions.append(f"{strike} BETWEEN t.spot_price * (1 - ?) AND t.spot_price * (1 + ?)")
+        condition_params.extend([moneyness, moneyness])
+
+    rows = _fetch_latest_per_expiry(symbol, expiries, ['t.expiry', 't.timestamp', 't.spot_price', 'j.value'],
+                                    joins="JOIN json_each(CASE WHEN json_valid(t.data_json) THEN t.data_json ELSE '[]' END) j", conditions=conditions,
+                                    condition_params=condition_params, order="t.expiry, j.key")
+
+    chains = {}
+    for expiry, timestamp, spot_price, value in rows:
+        if expiry not in chains:
+            chains[expiry] = {'expiry': expiry, 'timestamp': timestamp, 'spot_price': spot_price, 'data': []}
+        chains[expiry]['data'].append(json.loads(value))
+    return list(chains.values())
+
 def get_historical_snapshots(symbol, expiry):
     """
     Retrieves historical snapshots for a given symbol and expiry.
     """
+    import pandas as pd
     conn = sqlite3.connect(DB_NAME)
     query = '''
         SELECT timestamp, spot_price, data_json
@@ -99,3 +327,4 @@ def get_historical_snapshots(symbol, expiry):
 if __name__ == "__main__":
     init_db()
     print("Database initialized.")
+    print(f"Backfilled {rebuild_summaries()} snapshot summaries.")
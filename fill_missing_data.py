@@ -1,15 +1,10 @@
 import requests
-import pandas as pd
-import numpy as np
-from scipy.stats import norm
 import datetime
 import sqlite3
-import json
 import time
-import io
-import config
-from data_worker import get_implied_volatility, calculate_greeks, get_smart_trend
-from database import get_latest_snapshot
+import json
+from math_engine import get_implied_volatility, calculate_greeks, get_smart_trend
+from database import init_db, insert_snapshot, get_latest_snapshot_records
 
 DB_NAME = "option_chain.db"
 
@@ -106,10 +101,10 @@ def process_symbol(config_item, conn):
         T = get_time_to_expiry_at(expiry, current_time)
 
         # Fetch previous snapshot FROM DATABASE to calculate delta (handles 1m/5m gaps correctly)
-        _, _, prev_df = get_latest_snapshot(symbol, expiry, same_day_only=True)
+        _, _, prev_rows = get_latest_snapshot_records(symbol, expiry, same_day_only=True)
         prev_data_map = {}
-        if prev_df is not None:
-            for _, row in prev_df.iterrows():
+        if prev_rows is not None:
+            for row in prev_rows:
                 prev_data_map[row['strike']] = row
 
         strike_data_list = all_data[interval_str]
@@ -173,15 +168,12 @@ def process_symbol(config_item, conn):
             })
 
         if clean_data:
-            df = pd.DataFrame(clean_data)
-            cursor.execute('''
-                INSERT OR IGNORE INTO option_chain_snapshots (timestamp, symbol, expiry, spot_price, data_json)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (timestamp_str, symbol, expiry, spot_price, df.to_json(orient='records')))
+            insert_snapshot(cursor, timestamp_str, symbol, expiry, spot_price, json.dumps(clean_data))
             conn.commit()
             print(f"  Saved snapshot for {timestamp_str}")
 
 def main():
+    init_db()
     conn = sqlite3.connect(DB_NAME)
     for config_item in TRACKED_SYMBOLS:
         process_symbol(config_item, conn)
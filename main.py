@@ -3,8 +3,6 @@ import pandas as pd
 import datetime
 import time
 import io
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from database import get_latest_snapshot, get_historical_snapshots, init_db
 import config
 
@@ -30,8 +28,9 @@ def main():
     expiry = st.sidebar.text_input("Expiry Date", value=default_expiry)
     refresh_rate = st.sidebar.slider("Auto Refresh (sec)", 10, 60, 30)
 
-    # Main view tabs
-    tab_dashboard, tab_chain, tab_trends = st.tabs(["📊 Dashboard", "⛓️ Option Chain", "📈 Trends"])
+    # Main view selector. Unlike st.tabs (which runs every tab body on each rerun),
+    # only the selected view's code runs, so Trends alone pays for history + plotly.
+    view = st.radio("View", ["📊 Dashboard", "⛓️ Option Chain", "📈 Trends"], horizontal=True, label_visibility="collapsed")
 
     while True:
         # Read from DB
@@ -49,8 +48,8 @@ def main():
             res_strike = df.iloc[df['c_oi'].idxmax()]['strike']
             sup_strike = df.iloc[df['p_oi'].idxmax()]['strike']
 
-            # --- TAB 1: DASHBOARD ---
-            with tab_dashboard:
+            # --- VIEW 1: DASHBOARD ---
+            if view == "📊 Dashboard":
                 m1, m2, m3, m4 = st.columns(4)
                 m1.metric("Spot Price", f"{spot_price:,.2f}")
                 m2.metric("PCR (Sentiment)", f"{pcr} ({sentiment})")
@@ -69,8 +68,8 @@ def main():
                 with f2:
                     st.write(f"**Put Momentum:** {'🟢 Bullish' if p_chng > 0 else '🔴 Bearish/Unwinding'} ({p_chng:,.0f} OI)")
 
-            # --- TAB 2: OPTION CHAIN ---
-            with tab_chain:
+            # --- VIEW 2: OPTION CHAIN ---
+            elif view == "⛓️ Option Chain":
                 # Grouped columns for "Money Matrix" style
                 df_view = df[['c_ltp', 'c_oi', 'c_chng_oi', 'c_trend', 'strike', 'p_trend', 'p_chng_oi', 'p_oi', 'p_ltp']].copy()
                 df_view.columns = ['C_LTP', 'C_OI', 'C_Chng', 'C_Flow', 'STRIKE', 'P_Flow', 'P_Chng', 'P_OI', 'P_LTP']
@@ -84,10 +83,14 @@ def main():
                                     .format(precision=2, subset=['C_LTP', 'P_LTP']),
                              use_container_width=True, height=600)
 
-            # --- TAB 3: HISTORICAL TRENDS ---
-            with tab_trends:
+            # --- VIEW 3: HISTORICAL TRENDS ---
+            elif view == "📈 Trends":
                 hist = get_historical_snapshots(symbol, expiry)
                 if not hist.empty:
+                    # plotly is only loaded when the Trends view is selected and has history
+                    import plotly.graph_objects as go
+                    from plotly.subplots import make_subplots
+
                     processed = []
                     for _, row in hist.iterrows():
                         try:
@@ -0,0 +1,66 @@
+import math
+import datetime
+
+# --- MATH ENGINE ---
+# Black-Scholes helpers on plain floats. The normal CDF/PDF are computed with
+# the stdlib so the worker does not need scipy (or numpy) just to price a chain.
+SQRT_2 = math.sqrt(2.0)
+INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+def norm_cdf(x):
+    return 0.5 * (1.0 + math.erf(x / SQRT_2))
+
+def norm_pdf(x):
+    return INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+def get_implied_volatility(price, spot, strike, t, r, flag):
+    if price <= 0.05 or t <= 0.0001: return 0
+    low, high = 0.01, 5.0
+    for _ in range(15):
+        mid = (low + high) / 2
+        try:
+            d1 = (math.log(spot / strike) + (r + 0.5 * mid ** 2) * t) / (mid * math.sqrt(t))
+            d2 = d1 - mid * math.sqrt(t)
+            if flag == 'CE':
+                theo = spot * norm_cdf(d1) - strike * math.exp(-r * t) * norm_cdf(d2)
+            else:
+                theo = strike * math.exp(-r * t) * norm_cdf(-d2) - spot * norm_cdf(-d1)
+            if abs(theo - price) < 0.1: return mid
+            if theo > price: high = mid
+            else: low = mid
+        except: return 0
+    return (low + high) / 2
+
+def calculate_greeks(spot, strike, t, r, iv, opt_type):
+    try:
+        if iv <= 0.001 or t <= 0.0001 or spot <= 0: return {'delta': 0, 'theta': 0, 'gamma': 0, 'vega': 0}
+        d1 = (math.log(spot / strike) + (r + 0.5 * iv ** 2) * t) / (iv * math.sqrt(t))
+        d2 = d1 - iv * math.sqrt(t)
+        pdf_d1 = norm_pdf(d1)
+        if opt_type == 'CE':
+            delta = norm_cdf(d1)
+            theta = (-spot * pdf_d1 * iv / (2 * math.sqrt(t)) - r * strike * math.exp(-r * t) * norm_cdf(d2)) / 365
+        else:
+            delta = norm_cdf(d1) - 1
+            theta = (-spot * pdf_d1 * iv / (2 * math.sqrt(t)) + r * strike * math.exp(-r * t) * norm_cdf(-d2)) / 365
+        gamma = pdf_d1 / (spot * iv * math.sqrt(t))
+        vega = spot * math.sqrt(t) * pdf_d1 / 100
+        return {'delta': round(delta, 3), 'theta': round(theta, 2), 'gamma': round(gamma, 5), 'vega': round(vega, 2)}
+    except: return {'delta': 0, 'theta': 0, 'gamma': 0, 'vega': 0}
+
+def get_time_to_expiry(expiry_date_str):
+    try:
+        expiry = datetime.datetime.strptime(expiry_date_str, "%Y-%m-%d")
+        today = datetime.datetime.now()
+        expiry = expiry.replace(hour=15, minute=30, second=0)
+        diff = expiry - today
+        T = (diff.days + diff.seconds / 86400) / 365.0
+        return max(T, 0.00001)
+    except: return 0.00001
+
+def get_smart_trend(price_chg, oi_chg):
+    if price_chg > 0 and oi_chg > 0: return "Long Buildup"
+    if price_chg < 0 and oi_chg > 0: return "Short Buildup"
+    if price_chg < 0 and oi_chg < 0: return "Long Unwinding"
+    if price_chg > 0 and oi_chg < 0: return "Short Covering"
+    return "Neutral"